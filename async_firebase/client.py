@@ -513,17 +513,7 @@ class AsyncFirebaseClient(AsyncClientBase):
             self.assemble_push_notification(apns_config=message.apns, dry_run=dry_run, message=message)
             for message in messages
         ]
-
-        request_tasks: t.Collection[collections.abc.Awaitable] = [
-            self.send_request(
-                uri=self.FCM_ENDPOINT.format(project_id=self._credentials.project_id),  # type: ignore
-                json_payload=push_notification,
-                response_handler=FCMResponseHandler(),
-            )
-            for push_notification in push_notifications
-        ]
-        fcm_responses = await asyncio.gather(*request_tasks)
-        return FCMBatchResponse(responses=fcm_responses)
+        return await self._send_push_notifications(push_notifications)
 
     async def send_each_for_multicast(
         self,
@@ -537,20 +527,44 @@ class AsyncFirebaseClient(AsyncClientBase):
                 "device tokens."
             )
 
-        messages = [
-            Message(
-                token=token,
+        if not multicast_message.tokens:
+            return await self._send_push_notifications([])
+
+        # Push notifications differ only by the device token, so the message is assembled once and its cleaned up
+        # subtrees are shared between all the payloads.
+        push_notification = self.assemble_push_notification(
+            apns_config=multicast_message.apns,
+            dry_run=dry_run,
+            message=Message(
+                token=multicast_message.tokens[0],
                 data=multicast_message.data,
                 notification=multicast_message.notification,
                 android=multicast_message.android,
                 webpush=multicast_message.webpush,
                 apns=multicast_message.apns,
                 fcm_options=multicast_message.fcm_options,
-            )
+            ),
+        )
+        push_notifications = [
+            {**push_notification, "message": {**push_notification["message"], "token": token}}
             for token in multicast_message.tokens
         ]
+        return await self._send_push_notifications(push_notifications)
 
-        return await self.send_each(messages, dry_run=dry_run)
+    async def _send_push_notifications(self, push_notifications: t.List[t.Dict[str, t.Any]]) -> FCMBatchResponse:
+        """
+        Send assembled push notifications concurrently, one HTTP request per push notification.
+
+        :param push_notifications: push notification payloads ready to send
+        :return: instance of ``messages.FCMBatchResponse``
+        """
+        uri = self.FCM_ENDPOINT.format(project_id=self._credentials.project_id)  # type: ignore
+        request_tasks: t.Collection[collections.abc.Awaitable] = [
+            self.send_request(uri=uri, json_payload=push_notification, response_handler=FCMResponseHandler())
+            for push_notification in push_notifications
+        ]
+        fcm_responses = await asyncio.gather(*request_tasks)
+        return FCMBatchResponse(responses=fcm_responses)
 
     async def _make_topic_management_request(
         self, device_tokens: t.List[str], topic_name: str, action: str
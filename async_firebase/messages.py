@@ -450,12 +450,13 @@ class TopicManagementResponse:
         if not results:
             raise ValueError("Unexpected topic management response: {0}.".format(resp))
 
-        for index, result in enumerate(results):
-            if "error" in result:
-                self._failure_count += 1
-                self._errors.append(TopicManagementErrorInfo(index, result["error"]))
-            else:
-                self._success_count += 1
+        self._errors = [
+            TopicManagementErrorInfo(index, result["error"])
+            for index, result in enumerate(results)
+            if "error" in result
+        ]
+        self._failure_count = len(self._errors)
+        self._success_count = len(results) - self._failure_count
 
     @property
     def success_count(self):
@@ -1,5 +1,6 @@
 import io
 import json
+import re
 import typing as t
 from abc import ABC, abstractmethod
 from copy import deepcopy
@@ -8,6 +9,7 @@ from email.generator import Generator
 from email.mime.multipart import MIMEMultipart
 from email.mime.nonmultipart import MIMENonMultipart
 from email.parser import FeedParser
+from functools import lru_cache
 from urllib.parse import quote, urlencode, urljoin
 
 import httpx
@@ -27,6 +29,26 @@ from async_firebase.errors import (
 from async_firebase.messages import FCMBatchResponse, FCMResponse, TopicManagementResponse
 
 
+# characters ``urljoin`` treats specially: query, fragment, path params, IPv6 brackets, and whitespace/control
+# characters it strips
+_URLJOIN_SENSITIVE_CHARS = re.compile(r"[?#;\[\]\x00-\x20\x7f]")
+
+
+def _can_append_query(url: str) -> bool:
+    """Tell whether appending ``?query`` to the URL gives the same result as ``urljoin``.
+
+    It does for an http(s) URL or a relative path without any of ``_URLJOIN_SENSITIVE_CHARS``; anything else
+    (other schemes, network-path references, existing query or fragment, ...) is left to ``urljoin``.
+    """
+    if _URLJOIN_SENSITIVE_CHARS.search(url):
+        return False
+    scheme, separator, rest = url.partition("://")
+    if separator and scheme in ("http", "https"):
+        # with an empty host ``urljoin`` normalizes the path
+        return not rest.startswith("/")
+    return ":" not in url and not url.startswith("//")
+
+
 def join_url(
     base: str,
     *parts: t.Union[str, int],
@@ -46,25 +68,53 @@ def join_url(
     """
     url = base
     if parts:
-        quoted_and_stripped_parts = [quote(str(part).strip("/"), safe=": /") for part in parts]
-        url = "/".join([base.strip("/"), *quoted_and_stripped_parts])
+        # "/" is a safe character, so quoting the joined path equals quoting every part on its own
+        path = quote("/".join([part.strip("/") for part in map(str, parts)]), safe=": /")
+        url = f"{base.strip('/')}/{path}"
 
-    # trailing slash can be important
-    if trailing_slash:
-        url = f"{url}/"
-    # as well as a leading slash
-    if leading_slash:
-        url = f"/{url}"
+    if not (params or leading_slash or trailing_slash):
+        # the common case for FCM endpoints: nothing to append
+        return url
+
+    # trailing slash can be important as well as a leading slash
+    leading = "/" if leading_slash else ""
+    trailing = "/" if trailing_slash else ""
+    url = f"{leading}{url}{trailing}"
 
     if params:
-        url = urljoin(url, "?{}".format(urlencode(params)))
+        query = urlencode(params)
+        url = f"{url}?{query}" if _can_append_query(url) else urljoin(url, f"?{query}")
 
     return url
 
 
+_ATOMIC_TYPES = (type(None), bool, int, float, str, bytes)
+_EMPTY_LIST: t.List[t.Any] = []
+_EMPTY_DICT: t.Dict[str, t.Any] = {}
+
+
 def remove_null_values(dict_value: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
     """Remove Falsy values from the dictionary."""
-    return {k: v for k, v in dict_value.items() if v not in [None, [], {}]}
+    # only empty lists and dicts are dropped, falsy scalars are kept; ``not v`` goes first to skip the type check
+    return {k: v for k, v in dict_value.items() if not (v is None or (not v and isinstance(v, (list, dict))))}
+
+
+def _remove_null_values_from_new_dict(dict_value: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    """Same as ``remove_null_values``, but return the dictionary itself when there is nothing to remove.
+
+    Only meant for dictionaries nobody else holds a reference to, e.g. the ones built by ``cleanup_firebase_message``.
+    """
+    values = dict_value.values()
+    # membership tests run in C, which makes the scan cheap compared to building a new dictionary
+    if type(dict_value) is dict and None not in values and _EMPTY_LIST not in values and _EMPTY_DICT not in values:
+        return dict_value
+    return remove_null_values(dict_value)
+
+
+@lru_cache(maxsize=None)
+def _get_field_names(dataclass_type: type) -> t.Tuple[str, ...]:
+    """Return the field names of the dataclass type, computing them only once per type."""
+    return tuple(f.name for f in fields(dataclass_type))
 
 
 def cleanup_firebase_message(dataclass_obj, dict_factory: t.Callable = dict) -> dict:
@@ -119,16 +169,24 @@ def cleanup_firebase_message(dataclass_obj, dict_factory: t.Callable = dict) ->
         The function applies recursively to field values that are dataclass instances.
     :return: the fields of a dataclass instance as a new dictionary mapping field names to field values.
     """
-    if is_dataclass(dataclass_obj):
-        result = []
-        for f in fields(dataclass_obj):
-            value = cleanup_firebase_message(getattr(dataclass_obj, f.name), dict_factory)
-            result.append((f.name, value))
-        return remove_null_values(dict_factory(result))
+    if isinstance(dataclass_obj, _ATOMIC_TYPES):
+        # immutable values, ``deepcopy`` would return the very same object
+        return dataclass_obj
+    elif is_dataclass(dataclass_obj):
+        return _remove_null_values_from_new_dict(
+            dict_factory(
+                [
+                    (field_name, cleanup_firebase_message(getattr(dataclass_obj, field_name), dict_factory))
+                    for field_name in _get_field_names(type(dataclass_obj))
+                ]
+            )
+        )
     elif isinstance(dataclass_obj, (list, tuple)):
         return type(dataclass_obj)(cleanup_firebase_message(v, dict_factory) for v in dataclass_obj)  # type: ignore
     elif isinstance(dataclass_obj, dict):
-        return remove_null_values({k: cleanup_firebase_message(v, dict_factory) for k, v in dataclass_obj.items()})
+        return _remove_null_values_from_new_dict(
+            {k: cleanup_firebase_message(v, dict_factory) for k, v in dataclass_obj.items()}
+        )
     return deepcopy(dataclass_obj)
 
 
@@ -193,6 +251,8 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
         503: FcmErrorCode.UNAVAILABLE.value,
     }
 
+    FCM_ERROR_DETAIL_TYPE = "type.googleapis.com/google.firebase.fcm.v1.FcmError"
+
     FCM_ERROR_TYPES = {
         "APNS_AUTH_ERROR": ThirdPartyAuthError,
         "QUOTA_EXCEEDED": QuotaExceededError,
@@ -214,7 +274,10 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
         return FCMResponse(fcm_response=response.json())
 
     def _handle_error(self, error: httpx.HTTPError) -> FCMResponse:
-        exc = (
+        return FCMResponse(exception=self._error_to_exception(error))
+
+    def _error_to_exception(self, error: httpx.HTTPError):
+        return (
             (isinstance(error, httpx.HTTPStatusError) and self._handle_fcm_error(error))
             or (isinstance(error, httpx.HTTPError) and self._handle_request_error(error))
             or AsyncFirebaseError(
@@ -223,7 +286,6 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
                 cause=error,
             )
         )
-        return FCMResponse(exception=exc)
 
     def _handle_request_error(self, error: httpx.HTTPError):
         if isinstance(error, httpx.TimeoutException):
@@ -235,8 +297,9 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
 
         return self._get_error_by_status_code(t.cast(httpx.HTTPStatusError, error))
 
-    def _get_error_by_status_code(self, error: httpx.HTTPStatusError):
-        error_data = self._parse_platform_error(error.response)
+    def _get_error_by_status_code(self, error: httpx.HTTPStatusError, error_data: t.Optional[dict] = None):
+        if error_data is None:
+            error_data = self._parse_platform_error(error.response)
         code = error_data.get("status", self._http_status_to_error_code(error.response.status_code))
         err_type = self._error_code_to_exception_type(code)
         return err_type(message=error_data["message"], cause=error, http_response=error.response)  # type: ignore
@@ -244,7 +307,10 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
     def _handle_fcm_error(self, error: httpx.HTTPStatusError):
         error_data = self._parse_platform_error(error.response)
         err_type = self._get_fcm_error_type(error_data)
-        return err_type(error_data["message"], cause=error, http_response=error.response) if err_type else None
+        if err_type is None:
+            # Reuse the already parsed body instead of decoding the response once again.
+            return self._get_error_by_status_code(error, error_data)
+        return err_type(error_data["message"], cause=error, http_response=error.response)
 
     @classmethod
     def _http_status_to_error_code(cls, http_status_code: int) -> str:
@@ -259,12 +325,14 @@ class FCMResponseHandlerBase(ABC, t.Generic[FCMResponseType]):
         if not error_data:
             return None
 
-        fcm_code = None
-        for detail in error_data.get("details", []):
-            if detail.get("@type") == "type.googleapis.com/google.firebase.fcm.v1.FcmError":
-                fcm_code = detail.get("errorCode")
-                break
-
+        fcm_code = next(
+            (
+                detail.get("errorCode")
+                for detail in error_data.get("details", ())
+                if detail.get("@type") == cls.FCM_ERROR_DETAIL_TYPE
+            ),
+            None,
+        )
         if not fcm_code:
             return None
 
@@ -359,16 +427,7 @@ class FCMBatchResponseHandler(FCMResponseHandlerBase[FCMBatchResponse]):
 
 class TopicManagementResponseHandler(FCMResponseHandlerBase[TopicManagementResponse]):
     def handle_error(self, error: httpx.HTTPError) -> TopicManagementResponse:
-        exc = (
-            (isinstance(error, httpx.HTTPStatusError) and self._handle_fcm_error(error))
-            or (isinstance(error, httpx.HTTPError) and self._handle_request_error(error))
-            or AsyncFirebaseError(
-                code=FcmErrorCode.UNKNOWN.value,
-                message="Unexpected error has happened when hitting the FCM API",
-                cause=error,
-            )
-        )
-        return TopicManagementResponse(exception=exc)
+        return TopicManagementResponse(exception=self._error_to_exception(error))
 
     def handle_response(self, response: httpx.Response) -> TopicManagementResponse:
         return TopicManagementResponse(response)
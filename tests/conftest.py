@@ -7,12 +7,12 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from faker import Faker
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def faker_():
     return Faker()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fake_service_account(faker_):
     project_id = f"fake-mobile-app"
     client_email = f"firebase-adminsdk-h18o4@{project_id}.iam.gserviceaccount.com"
@@ -36,7 +36,7 @@ def fake_service_account(faker_):
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fake_service_account_file(fake_service_account, faker_):
     file_name = Path(f"fake-mobile-app-{faker_.pystr(min_chars=12, max_chars=18)}.json")
     with open(str(file_name), "w") as outfile:
@@ -1,7 +1,10 @@
+import asyncio
 import json
+import random
+import string
+import typing as t
 import uuid
 from datetime import datetime
-from unittest import mock
 
 import pkg_resources
 import pytest
@@ -32,31 +35,91 @@ from async_firebase.utils import FcmErrorCode
 
 pytestmark = pytest.mark.asyncio
 
+UNAUTHENTICATED_ERROR_RESPONSE = {
+    "error": {
+        "code": 401,
+        "message": "Request had invalid authentication credentials. "
+        "Expected OAuth 2 access token, login cookie or other "
+        "valid authentication credential. See "
+        "https://developers.google.com/identity/sign-in/web/devconsole-project.",
+        "status": "UNAUTHENTICATED",
+    }
+}
+TOPIC_MANAGEMENT_SUCCESS_RESPONSE = {"results": [{}, {}, {}]}
+TOPIC_MANAGEMENT_PARTIAL_FAILURE_RESPONSE = {"results": [{}, {}, {}, {"error": "INVALID_ARGUMENT"}]}
+
 
 @pytest.fixture()
 def fake_async_fcm_client():
     return AsyncFirebaseClient()
 
 
-@pytest.fixture()
-def fake_async_fcm_client_w_creds(fake_async_fcm_client, fake_service_account):
+@pytest.fixture(scope="session")
+def fake_credentials(fake_service_account):
     client = AsyncFirebaseClient()
     client.creds_from_service_account_info(fake_service_account)
-    return client
+    return client._credentials
 
 
-@pytest.fixture()
-def fake_device_token(faker_):
-    return faker_.bothify(text=f"{'?' * 12}:{'?' * 256}")
+@pytest.fixture(scope="session")
+def fake_http_client():
+    # Requests never reach the connection pool (``httpx_mock`` patches the transport), so a single client can be
+    # shared by all the tests instead of building a new one, SSL context included, for every test.
+    http_client = AsyncFirebaseClient()._client
+    yield http_client
+    asyncio.run(http_client.aclose())
+
+
+async def fake__get_access_token():
+    return "fake-jwt-token"
 
 
 @pytest.fixture()
-def fake_multi_device_tokens(faker_, request):
-    return [faker_.bothify(text=f"{'?' * 12}:{'?' * 256}") for _ in range(request.param)]
+def fake_async_fcm_client_w_creds(fake_credentials, fake_http_client):
+    client = AsyncFirebaseClient(credentials=fake_credentials)
+    client._http_client = fake_http_client
+    client._get_access_token = fake__get_access_token
+    return client
 
 
-async def fake__get_access_token():
-    return "fake-jwt-token"
+_token_random = random.Random(42)
+
+
+def generate_fake_device_token() -> str:
+    prefix = "".join(_token_random.choices(string.ascii_letters, k=12))
+    suffix = "".join(_token_random.choices(string.ascii_letters, k=256))
+    return f"{prefix}:{suffix}"
+
+
+@pytest.fixture(scope="session")
+def fake_device_token():
+    return generate_fake_device_token()
+
+
+@pytest.fixture(scope="session")
+def fake_multi_device_tokens(request):
+    return [generate_fake_device_token() for _ in range(request.param)]
+
+
+@pytest.fixture(scope="module")
+def fake_apns_config():
+    return AsyncFirebaseClient.build_apns_config(
+        priority="normal",
+        apns_topic="test-push",
+        collapse_key="push",
+        badge=0,
+        category="test-category",
+        custom_data={"foo": "bar"},
+    )
+
+
+def add_fake_success_responses(httpx_mock: HTTPXMock, project_id: str, message_ids: t.Iterable[str]) -> None:
+    for message_id in message_ids:
+        httpx_mock.add_response(
+            status_code=200,
+            content=b'{"name": "projects/%s/messages/%s"}' % (project_id.encode(), message_id.encode()),
+            headers={"content-type": "application/json"},
+        )
 
 
 def test_build_android_config(fake_async_fcm_client_w_creds):
@@ -102,6 +165,7 @@ def test_build_android_config(fake_async_fcm_client_w_creds):
 
 
 def test_build_apns_config(fake_async_fcm_client_w_creds, freezer):
+    exp_expiration = str(int(datetime.utcnow().timestamp()) + 7200)
     apns_message = fake_async_fcm_client_w_creds.build_apns_config(
         priority="high",
         ttl=7200,
@@ -114,7 +178,7 @@ def test_build_apns_config(fake_async_fcm_client_w_creds, freezer):
     assert apns_message == APNSConfig(
         **{
             "headers": {
-                "apns-expiration": str(int(datetime.utcnow().timestamp()) + 7200),
+                "apns-expiration": exp_expiration,
                 "apns-priority": "10",
                 "apns-topic": "test-topic",
                 "apns-collapse-id": "something",
@@ -140,7 +204,6 @@ def test_build_apns_config(fake_async_fcm_client_w_creds, freezer):
 
 
 async def test_prepare_headers(fake_async_fcm_client_w_creds):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     frozen_uuid = uuid.UUID(hex="6eadf1d38633427cb83dbb9be137f48c")
     fake_async_fcm_client_w_creds.get_request_id = lambda: str(frozen_uuid)
     headers = await fake_async_fcm_client_w_creds.prepare_headers()
@@ -153,74 +216,38 @@ async def test_prepare_headers(fake_async_fcm_client_w_creds):
     }
 
 
-async def test_push(fake_async_fcm_client_w_creds, fake_device_token, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    creds = fake_async_fcm_client_w_creds._credentials
+async def test_push(fake_async_fcm_client_w_creds, fake_apns_config, fake_device_token, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         status_code=200,
-        json={"name": f"projects/{creds.project_id}/messages/0:1612788010922733%7606eb247606eb24"},
+        content=b'{"name": "projects/fake-mobile-app/messages/0:1612788010922733%7606eb247606eb24"}',
+        headers={"content-type": "application/json"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
-    message = Message(apns=apns_config, token=fake_device_token)
+    message = Message(apns=fake_apns_config, token=fake_device_token)
     response = await fake_async_fcm_client_w_creds.send(message)
     assert isinstance(response, FCMResponse)
     assert response.success
     assert response.message_id == "projects/fake-mobile-app/messages/0:1612788010922733%7606eb247606eb24"
 
 
-async def test_send_dry_run(fake_async_fcm_client_w_creds, fake_device_token, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    creds = fake_async_fcm_client_w_creds._credentials
+async def test_send_dry_run(fake_async_fcm_client_w_creds, fake_apns_config, fake_device_token, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         status_code=200,
-        json={"name": f"projects/{creds.project_id}/messages/fake_message_id"},
+        content=b'{"name": "projects/fake-mobile-app/messages/fake_message_id"}',
+        headers={"content-type": "application/json"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
-    message = Message(apns=apns_config, token=fake_device_token)
+    message = Message(apns=fake_apns_config, token=fake_device_token)
     response = await fake_async_fcm_client_w_creds.send(message, dry_run=True)
     assert isinstance(response, FCMResponse)
     assert response.success
     assert response.message_id == "projects/fake-mobile-app/messages/fake_message_id"
 
 
-async def test_send_unauthenticated(fake_async_fcm_client_w_creds, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
+async def test_send_unauthenticated(fake_async_fcm_client_w_creds, fake_apns_config, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         status_code=401,
-        json={
-            "error": {
-                "code": 401,
-                "message": "Request had invalid authentication credentials. "
-                "Expected OAuth 2 access token, login cookie or other "
-                "valid authentication credential. See "
-                "https://developers.google.com/identity/sign-in/web/devconsole-project.",
-                "status": "UNAUTHENTICATED",
-            }
-        },
-    )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
+        json=UNAUTHENTICATED_ERROR_RESPONSE,
     )
-    message = Message(apns=apns_config, token="qwerty:ytrewq")
+    message = Message(apns=fake_apns_config, token="qwerty:ytrewq")
     fcm_response = await fake_async_fcm_client_w_creds.send(message)
 
     assert isinstance(fcm_response, FCMResponse)
@@ -247,11 +274,10 @@ def test_creds_from_service_account_file(fake_async_fcm_client, fake_service_acc
 
 
 async def test_send_realistic_payload(fake_async_fcm_client_w_creds, fake_device_token, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    creds = fake_async_fcm_client_w_creds._credentials
     httpx_mock.add_response(
         status_code=200,
-        json={"name": f"projects/{creds.project_id}/messages/0:1612788010922733%7606eb247606eb24"},
+        content=b'{"name": "projects/fake-mobile-app/messages/0:1612788010922733%7606eb247606eb24"}',
+        headers={"content-type": "application/json"},
     )
     apns_config: APNSConfig = fake_async_fcm_client_w_creds.build_apns_config(
         priority="normal",
@@ -294,9 +320,10 @@ async def test_send_realistic_payload(fake_async_fcm_client_w_creds, fake_device
     }
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
-async def test_send_all(fake_async_fcm_client_w_creds, fake_multi_device_tokens: list, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
+async def test_send_all(
+    fake_async_fcm_client_w_creds, fake_apns_config, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
+):
     creds = fake_async_fcm_client_w_creds._credentials
     response_data = (
         "\r\n--batch_llG_9dniIyeFXPERplIRPwpVYtn3RBa4\r\nContent-Type: application/http\r\nContent-ID: "
@@ -319,16 +346,8 @@ async def test_send_all(fake_async_fcm_client_w_creds, fake_multi_device_tokens:
         content=response_data.encode(),
         headers={"content-type": "multipart/mixed; boundary=batch_llG_9dniIyeFXPERplIRPwpVYtn3RBa4"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
     messages = [
-        Message(apns=apns_config, token=fake_device_token) for fake_device_token in fake_multi_device_tokens
+        Message(apns=fake_apns_config, token=fake_device_token) for fake_device_token in fake_multi_device_tokens
     ]
     response = await fake_async_fcm_client_w_creds.send_all(messages)
     assert isinstance(response, FCMBatchResponse)
@@ -339,24 +358,17 @@ async def test_send_all(fake_async_fcm_client_w_creds, fake_multi_device_tokens:
     assert response.responses[2].message_id == "projects/fake-mobile-app/messages/0:1612788010922733%7606eb247606eb26"
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_send_each_makes_proper_http_calls(
     fake_async_fcm_client_w_creds, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    creds = fake_async_fcm_client_w_creds._credentials
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     creds = fake_async_fcm_client_w_creds._credentials
     response_message_ids = [
         "0:1612788010922733%7606eb247606eb24",
         "0:1612788010922733%7606eb247606eb35",
         "0:1612788010922733%7606eb247606eb46",
     ]
-    for message_id in response_message_ids:
-        httpx_mock.add_response(
-            status_code=200,
-            json={"name": f"projects/{creds.project_id}/messages/{message_id}"},
-        )
+    add_fake_success_responses(httpx_mock, creds.project_id, response_message_ids)
     apns_config: APNSConfig = fake_async_fcm_client_w_creds.build_apns_config(
         priority="normal",
         apns_topic="Your bucket has been updated",
@@ -371,7 +383,8 @@ async def test_send_each_makes_proper_http_calls(
         Message(apns=apns_config, token=fake_device_token) for fake_device_token in fake_multi_device_tokens
     ]
     await fake_async_fcm_client_w_creds.send_each(messages)
-    request_payloads = [json.loads(request.read()) for request in httpx_mock.get_requests()]
+    requests = httpx_mock.get_requests()
+    assert len(requests) == len(fake_multi_device_tokens)
     expected_request_payloads = [
         {
             "message": {
@@ -390,30 +403,23 @@ async def test_send_each_makes_proper_http_calls(
                 "token": fake_device_token,
             },
             "validate_only": False,
-        } for fake_device_token in fake_multi_device_tokens
+        }
+        for fake_device_token in fake_multi_device_tokens
     ]
-    for payload, expected_payload in zip(request_payloads, expected_request_payloads):
-        assert payload == expected_payload
+    assert [json.loads(request.read()) for request in requests] == expected_request_payloads
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_send_each_returns_correct_data(
     fake_async_fcm_client_w_creds, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    creds = fake_async_fcm_client_w_creds._credentials
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     creds = fake_async_fcm_client_w_creds._credentials
     response_message_ids = [
         "0:1612788010922733%7606eb247606eb24",
         "0:1612788010922733%7606eb247606eb35",
         "0:1612788010922733%7606eb247606eb46",
     ]
-    for message_id in (response_message_ids[0], response_message_ids[1]):
-        httpx_mock.add_response(
-            status_code=200,
-            json={"name": f"projects/{creds.project_id}/messages/{message_id}"},
-        )
+    add_fake_success_responses(httpx_mock, creds.project_id, response_message_ids[:2])
     httpx_mock.add_response(status_code=500)
     apns_config: APNSConfig = fake_async_fcm_client_w_creds.build_apns_config(
         priority="normal",
@@ -444,40 +450,45 @@ async def test_send_each_returns_correct_data(
     # check failed response
     failed_fcm_response = fcm_batch_response.responses[2]
     assert failed_fcm_response.message_id is None
-    assert isinstance(failed_fcm_response.exception, InternalError)
+    assert type(failed_fcm_response.exception) is InternalError
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_send_each_for_multicast(
-    fake_async_fcm_client_w_creds, fake_multi_device_tokens: list,
+    fake_async_fcm_client_w_creds, fake_apns_config, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    send_each_mock = mock.AsyncMock()
-    fake_async_fcm_client_w_creds.send_each = send_each_mock
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
-    await fake_async_fcm_client_w_creds.send_each_for_multicast(
-        MulticastMessage(apns=apns_config, tokens=fake_multi_device_tokens),
+    creds = fake_async_fcm_client_w_creds._credentials
+    response_message_ids = [f"0:1612788010922733%7606eb247606eb{i}" for i in range(len(fake_multi_device_tokens))]
+    add_fake_success_responses(httpx_mock, creds.project_id, response_message_ids)
+    fcm_batch_response = await fake_async_fcm_client_w_creds.send_each_for_multicast(
+        MulticastMessage(apns=fake_apns_config, tokens=fake_multi_device_tokens),
+    )
+    assert fcm_batch_response.success_count == len(fake_multi_device_tokens)
+    assert fcm_batch_response.failure_count == 0
+
+    requests = httpx_mock.get_requests()
+    assert [json.loads(request.read()) for request in requests] == [
+        AsyncFirebaseClient.assemble_push_notification(
+            apns_config=fake_apns_config, dry_run=False, message=Message(apns=fake_apns_config, token=token)
+        )
+        for token in fake_multi_device_tokens
+    ]
+
+
+async def test_send_each_for_multicast_no_tokens(
+    fake_async_fcm_client_w_creds, fake_apns_config, httpx_mock: HTTPXMock
+):
+    fcm_batch_response = await fake_async_fcm_client_w_creds.send_each_for_multicast(
+        MulticastMessage(apns=fake_apns_config, tokens=[]),
     )
-    send_each_argument = send_each_mock.call_args[0][0]
-    assert isinstance(send_each_argument, list)
-    for message in send_each_argument:
-        assert isinstance(message, Message)
-        assert message.apns == apns_config
-        assert message.token is not None
+    assert fcm_batch_response.responses == []
+    assert httpx_mock.get_requests() == []
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_send_all_dry_run(
-    fake_async_fcm_client_w_creds, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
+    fake_async_fcm_client_w_creds, fake_apns_config, fake_multi_device_tokens: list, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     creds = fake_async_fcm_client_w_creds._credentials
     response_data = (
         "\r\n--batch_llG_9dniIyeFXPERplIRPwpVYtn3RBa4\r\nContent-Type: application/http\r\nContent-ID: "
@@ -499,16 +510,8 @@ async def test_send_all_dry_run(
         content=response_data.encode(),
         headers={"content-type": "multipart/mixed; boundary=batch_llG_9dniIyeFXPERplIRPwpVYtn3RBa4"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
     messages = [
-        Message(apns=apns_config, token=fake_device_token) for fake_device_token in fake_multi_device_tokens
+        Message(apns=fake_apns_config, token=fake_device_token) for fake_device_token in fake_multi_device_tokens
     ]
     response = await fake_async_fcm_client_w_creds.send_all(messages, dry_run=True)
 
@@ -520,29 +523,21 @@ async def test_send_all_dry_run(
     assert response.responses[2].message_id == "projects/fake-mobile-app/messages/fake_message_id"
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (501, 600, 1000), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (501,), indirect=True)
 async def test_send_multicast_too_many_tokens(
-    fake_async_fcm_client_w_creds,
+    fake_async_fcm_client_w_creds, fake_apns_config,
     fake_multi_device_tokens: list,
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
     with pytest.raises(ValueError):
         await fake_async_fcm_client_w_creds.send_multicast(
-            MulticastMessage(apns=apns_config, tokens=fake_multi_device_tokens),
+            MulticastMessage(apns=fake_apns_config, tokens=fake_multi_device_tokens),
             dry_run=True
         )
 
 
-async def test_send_all_unknown_registration_token(fake_async_fcm_client_w_creds, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
+async def test_send_all_unknown_registration_token(
+    fake_async_fcm_client_w_creds, fake_apns_config, httpx_mock: HTTPXMock
+):
     response_data = (
         "\r\n--batch_HwFDZe-SUCq5qEgCavJPhhi8tA7xJBlB\r\nContent-Type: application/http\r\nContent-ID: "
         "response-363ad2c9-a3d1-45f5-b559-6d69a13a880e\r\n\r\nHTTP/1.1 400 Bad Request\r\nVary: Origin\r\nVary: "
@@ -557,15 +552,7 @@ async def test_send_all_unknown_registration_token(fake_async_fcm_client_w_creds
         content=response_data.encode(),
         headers={"content-type": "multipart/mixed; boundary=batch_HwFDZe-SUCq5qEgCavJPhhi8tA7xJBlB"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
-    messages = [Message(apns=apns_config, token="qwerty:ytrewq")]
+    messages = [Message(apns=fake_apns_config, token="qwerty:ytrewq")]
     response = await fake_async_fcm_client_w_creds.send_all(messages)
 
     assert isinstance(response, FCMBatchResponse)
@@ -575,8 +562,9 @@ async def test_send_all_unknown_registration_token(fake_async_fcm_client_w_creds
     assert response.responses[0].exception.cause.response.status_code == 400
 
 
-async def test_send_response_error_invalid_argument(fake_async_fcm_client_w_creds, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
+async def test_send_response_error_invalid_argument(
+    fake_async_fcm_client_w_creds, fake_apns_config, httpx_mock: HTTPXMock
+):
     response_data = (
         '\r\n--batch_H3WKviwlw1OiFBuquMNPomHJtcBwS2Oi\r\n'
         'Content-Type: application/http\r\n'
@@ -597,15 +585,7 @@ async def test_send_response_error_invalid_argument(fake_async_fcm_client_w_cred
         content=response_data.encode(),
         headers={"content-type": "multipart/mixed; boundary=batch_HwFDZe-SUCq5qEgCavJPhhi8tA7xJBlB"},
     )
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
-    messages = [Message(apns=apns_config, token="qwerty:ytrewq")]
+    messages = [Message(apns=fake_apns_config, token="qwerty:ytrewq")]
     response = await fake_async_fcm_client_w_creds.send_all(messages)
 
     assert isinstance(response, FCMBatchResponse)
@@ -621,23 +601,14 @@ async def test_send_all_data_has_not_provided(fake_async_fcm_client_w_creds):
         await fake_async_fcm_client_w_creds.send_all(messages)
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (501, 600, 1000), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (501,), indirect=True)
 async def test_send_all_too_many_messages(
-    fake_async_fcm_client_w_creds,
+    fake_async_fcm_client_w_creds, fake_apns_config,
     fake_multi_device_tokens: list,
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-    apns_config = fake_async_fcm_client_w_creds.build_apns_config(
-        priority="normal",
-        apns_topic="test-push",
-        collapse_key="push",
-        badge=0,
-        category="test-category",
-        custom_data={"foo": "bar"},
-    )
     with pytest.raises(ValueError):
         await fake_async_fcm_client_w_creds.send_all(
-            [Message(apns=apns_config, token=device_token) for device_token in fake_multi_device_tokens],
+            [Message(apns=fake_apns_config, token=device_token) for device_token in fake_multi_device_tokens],
             dry_run=True
         )
 
@@ -701,9 +672,10 @@ async def test_send_all_too_many_messages(
             },
         ),
     ),
+    ids=("no_apns_config", "empty_apns_config", "apns_config_with_aps"),
 )
-def test_assemble_push_notification(fake_async_fcm_client_w_creds, apns_config, message, exp_push_notification):
-    push_notification = fake_async_fcm_client_w_creds.assemble_push_notification(
+def test_assemble_push_notification(apns_config, message, exp_push_notification):
+    push_notification = AsyncFirebaseClient.assemble_push_notification(
         apns_config=apns_config, dry_run=True, message=message
     )
     assert push_notification == exp_push_notification
@@ -739,12 +711,11 @@ def test_build_webpush_config(fake_async_fcm_client_w_creds):
     )
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_subscribe_to_topic(fake_async_fcm_client_w_creds, fake_multi_device_tokens, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     httpx_mock.add_response(
         status_code=200,
-        json={"results": [{}, {}, {}]},
+        json=TOPIC_MANAGEMENT_SUCCESS_RESPONSE,
     )
     response = await fake_async_fcm_client_w_creds.subscribe_devices_to_topic(
         topic_name="test_topic", device_tokens=fake_multi_device_tokens
@@ -755,16 +726,14 @@ async def test_subscribe_to_topic(fake_async_fcm_client_w_creds, fake_multi_devi
     assert response.failure_count == 0
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_subscribe_to_topic_with_incorrect(
         fake_async_fcm_client_w_creds, fake_multi_device_tokens, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-
     device_tokens = [*fake_multi_device_tokens, "incorrect"]
     httpx_mock.add_response(
         status_code=200,
-        json={"results": [{}, {}, {}, {"error": "INVALID_ARGUMENT"}]},
+        json=TOPIC_MANAGEMENT_PARTIAL_FAILURE_RESPONSE,
     )
     response = await fake_async_fcm_client_w_creds.subscribe_devices_to_topic(
         topic_name='test_topic', device_tokens=device_tokens
@@ -779,12 +748,11 @@ async def test_subscribe_to_topic_with_incorrect(
     assert response.errors[0].reason == "INVALID_ARGUMENT"
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_unsubscribe_to_topic(fake_async_fcm_client_w_creds, fake_multi_device_tokens, httpx_mock: HTTPXMock):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     httpx_mock.add_response(
         status_code=200,
-        json={"results": [{}, {}, {}]},
+        json=TOPIC_MANAGEMENT_SUCCESS_RESPONSE,
     )
     response = await fake_async_fcm_client_w_creds.unsubscribe_devices_from_topic(
         topic_name="test_topic", device_tokens=fake_multi_device_tokens
@@ -795,16 +763,14 @@ async def test_unsubscribe_to_topic(fake_async_fcm_client_w_creds, fake_multi_de
     assert response.failure_count == 0
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_unsubscribe_to_topic_with_incorrect(
         fake_async_fcm_client_w_creds, fake_multi_device_tokens, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
-
     device_tokens = [*fake_multi_device_tokens, "incorrect"]
     httpx_mock.add_response(
         status_code=200,
-        json={"results": [{}, {}, {}, {"error": "INVALID_ARGUMENT"}]},
+        json=TOPIC_MANAGEMENT_PARTIAL_FAILURE_RESPONSE,
     )
     response = await fake_async_fcm_client_w_creds.unsubscribe_devices_from_topic(
         topic_name='test_topic', device_tokens=device_tokens
@@ -819,23 +785,13 @@ async def test_unsubscribe_to_topic_with_incorrect(
     assert response.errors[0].reason == "INVALID_ARGUMENT"
 
 
-@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True)
+@pytest.mark.parametrize("fake_multi_device_tokens", (3,), indirect=True, scope="session")
 async def test_send_topic_management_unauthenticated(
     fake_async_fcm_client_w_creds, fake_multi_device_tokens, httpx_mock: HTTPXMock
 ):
-    fake_async_fcm_client_w_creds._get_access_token = fake__get_access_token
     httpx_mock.add_response(
         status_code=401,
-        json={
-            "error": {
-                "code": 401,
-                "message": "Request had invalid authentication credentials. "
-                "Expected OAuth 2 access token, login cookie or other "
-                "valid authentication credential. See "
-                "https://developers.google.com/identity/sign-in/web/devconsole-project.",
-                "status": "UNAUTHENTICATED",
-            }
-        },
+        json=UNAUTHENTICATED_ERROR_RESPONSE,
     )
     response = await fake_async_fcm_client_w_creds.unsubscribe_devices_from_topic(
         topic_name="test_topic", device_tokens=fake_multi_device_tokens
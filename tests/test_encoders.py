@@ -127,3 +127,9 @@ def test_aps_encoder_does_not_modify_custom_data():
     aps_encoder(aps)
     assert len(custom_data) == 6
     assert aps.custom_data == custom_data
+
+    # a nested "aps" overrides the encoded one and must not be written into either
+    nested_aps_custom_data = {"aps": {"sound": "generic"}}
+    aps = Aps(alert="push text", content_available=True, custom_data=nested_aps_custom_data)
+    aps_encoder(aps)
+    assert nested_aps_custom_data == {"aps": {"sound": "generic"}}
@@ -66,154 +66,173 @@ pytestmark = pytest.mark.asyncio
             {"key_1": {"sub_key_1": {}, "sub_key_2": None, "sub_key_3": []}},
         ),
     ),
+    ids=("all_empty", "mixed_none", "falsy_kept", "empty", "nested"),
 )
 def test_remove_null_values(data, exp_result):
     result = remove_null_values(data)
     assert result == exp_result
 
 
-@pytest.mark.parametrize(
-    "firebase_message, exp_result",
+def test_remove_null_values_returns_new_dict():
+    data = {"key_1": "value_1", "key_2": {"sub_key": None}, "key_3": 0}
+    result = remove_null_values(data)
+    assert result == data
+    assert result is not data
+
+
+_ANDROID_GROUP = AndroidConfig(
+    collapse_key="group",
+    notification=AndroidNotification(title="android-push-title", body="android-push-body"),
+)
+_ANDROID_GROUP_RESULT = {
+    "collapse_key": "group",
+    "notification": {
+        "title": "android-push-title",
+        "body": "android-push-body",
+    },
+}
+_APNS_HEADERS = {
+    "apns-expiration": "1621594859",
+    "apns-priority": "5",
+    "apns-collapse-id": "ENTITY_UPDATED",
+}
+_APNS_PAYLOAD = {
+    "aps": {
+        "alert": "push-text",
+        "badge": 5,
+        "sound": "default",
+        "content-available": True,
+        "category": "NEW_MESSAGE",
+        "mutable-content": False,
+    },
+    "custom_attr_1": "value_1",
+    "custom_attr_2": 42,
+}
+_APNS_FULL = APNSConfig(headers=_APNS_HEADERS, payload=_APNS_PAYLOAD)
+_APNS_FULL_RESULT = {
+    "headers": {
+        "apns-expiration": "1621594859",
+        "apns-priority": "5",
+        "apns-collapse-id": "ENTITY_UPDATED",
+    },
+    "payload": {
+        "aps": {
+            "alert": "push-text",
+            "badge": 5,
+            "sound": "default",
+            "content-available": True,
+            "category": "NEW_MESSAGE",
+            "mutable-content": False,
+        },
+        "custom_attr_1": "value_1",
+        "custom_attr_2": 42,
+    },
+}
+
+CLEANUP_FIREBASE_MESSAGE_CASES = (
     (
-        (
-            AndroidNotification(title="push-title", body="push-body"),
-            {"title": "push-title", "body": "push-body"},
-        ),
-        (
-            AndroidConfig(collapse_key="group", priority="normal", ttl="3600s"),
-            {"collapse_key": "group", "priority": "normal", "ttl": "3600s"},
-        ),
-        (
-            ApsAlert(title="push-title", body="push-body"),
-            {"title": "push-title", "body": "push-body"},
-        ),
-        (Aps(alert="alert", badge=9), {"alert": "alert", "badge": 9}),
-        (
-            APNSPayload(aps=Aps(alert="push-text", custom_data={"foo": "bar"})),
-            {"aps": {"alert": "push-text", "custom_data": {"foo": "bar"}}},
-        ),
-        (
-            APNSConfig(headers={"x-header": "x-data"}),
-            {"headers": {"x-header": "x-data"}},
-        ),
-        (
-            Notification(title="push-title", body="push-body"),
-            {"title": "push-title", "body": "push-body"},
-        ),
-        (
-            Notification(title="push-title", body="push-body", image="https://cdn.domain.com/public.image.png"),
-            {"title": "push-title", "body": "push-body", "image": "https://cdn.domain.com/public.image.png"},
-        ),
-        (
-            Message(
-                token="qwerty",
-                notification=Notification(title="push-title", body="push-body"),
-                apns=APNSConfig(
-                    headers={"hdr": "qwe"},
-                    payload=APNSPayload(
-                        aps=Aps(
-                            sound="generic",
-                        ),
+        AndroidNotification(title="push-title", body="push-body"),
+        {"title": "push-title", "body": "push-body"},
+    ),
+    (
+        AndroidConfig(collapse_key="group", priority="normal", ttl="3600s"),
+        {"collapse_key": "group", "priority": "normal", "ttl": "3600s"},
+    ),
+    (
+        ApsAlert(title="push-title", body="push-body"),
+        {"title": "push-title", "body": "push-body"},
+    ),
+    (Aps(alert="alert", badge=9), {"alert": "alert", "badge": 9}),
+    (
+        APNSPayload(aps=Aps(alert="push-text", custom_data={"foo": "bar"})),
+        {"aps": {"alert": "push-text", "custom_data": {"foo": "bar"}}},
+    ),
+    (
+        APNSConfig(headers={"x-header": "x-data"}),
+        {"headers": {"x-header": "x-data"}},
+    ),
+    (
+        Notification(title="push-title", body="push-body"),
+        {"title": "push-title", "body": "push-body"},
+    ),
+    (
+        Notification(title="push-title", body="push-body", image="https://cdn.domain.com/public.image.png"),
+        {"title": "push-title", "body": "push-body", "image": "https://cdn.domain.com/public.image.png"},
+    ),
+    (
+        Message(
+            token="qwerty",
+            notification=Notification(title="push-title", body="push-body"),
+            apns=APNSConfig(
+                headers={"hdr": "qwe"},
+                payload=APNSPayload(
+                    aps=Aps(
+                        sound="generic",
                     ),
                 ),
             ),
-            {
-                "token": "qwerty",
-                "notification": {"title": "push-title", "body": "push-body"},
-                "apns": {
-                    "headers": {"hdr": "qwe"},
-                    "payload": {"aps": {"sound": "generic"}},
-                },
-            },
         ),
-        (
-            PushNotification(
-                message=Message(
-                    token="secret-token",
-                    notification=Notification(title="push-title", body="push-body"),
-                    android=AndroidConfig(
-                        collapse_key="group",
-                        notification=AndroidNotification(title="android-push-title", body="android-push-body"),
-                    ),
-                )
-            ),
-            {
-                "message": {
-                    "token": "secret-token",
-                    "notification": {"title": "push-title", "body": "push-body"},
-                    "android": {
-                        "collapse_key": "group",
-                        "notification": {
-                            "title": "android-push-title",
-                            "body": "android-push-body",
-                        },
-                    },
-                },
-                "validate_only": False,
+        {
+            "token": "qwerty",
+            "notification": {"title": "push-title", "body": "push-body"},
+            "apns": {
+                "headers": {"hdr": "qwe"},
+                "payload": {"aps": {"sound": "generic"}},
             },
+        },
+    ),
+    (
+        PushNotification(
+            message=Message(
+                token="secret-token",
+                notification=Notification(title="push-title", body="push-body"),
+                android=_ANDROID_GROUP,
+            )
         ),
-        (
-            PushNotification(
-                message=Message(
-                    token="secret-token",
-                    android=AndroidConfig(
-                        collapse_key="group",
-                        notification=AndroidNotification(title="android-push-title", body="android-push-body"),
-                    ),
-                    apns=APNSConfig(
-                        headers={
-                            "apns-expiration": "1621594859",
-                            "apns-priority": "5",
-                            "apns-collapse-id": "ENTITY_UPDATED",
-                        },
-                        payload={
-                            "aps": {
-                                "alert": "push-text",
-                                "badge": 5,
-                                "sound": "default",
-                                "content-available": True,
-                                "category": "NEW_MESSAGE",
-                                "mutable-content": False,
-                            },
-                            "custom_attr_1": "value_1",
-                            "custom_attr_2": 42,
-                        },
-                    ),
-                )
-            ),
-            {
-                "message": {
-                    "token": "secret-token",
-                    "android": {
-                        "collapse_key": "group",
-                        "notification": {
-                            "title": "android-push-title",
-                            "body": "android-push-body",
-                        },
-                    },
-                    "apns": {
-                        "headers": {
-                            "apns-expiration": "1621594859",
-                            "apns-priority": "5",
-                            "apns-collapse-id": "ENTITY_UPDATED",
-                        },
-                        "payload": {
-                            "aps": {
-                                "alert": "push-text",
-                                "badge": 5,
-                                "sound": "default",
-                                "content-available": True,
-                                "category": "NEW_MESSAGE",
-                                "mutable-content": False,
-                            },
-                            "custom_attr_1": "value_1",
-                            "custom_attr_2": 42,
-                        },
-                    },
-                },
-                "validate_only": False,
+        {
+            "message": {
+                "token": "secret-token",
+                "notification": {"title": "push-title", "body": "push-body"},
+                "android": _ANDROID_GROUP_RESULT,
             },
+            "validate_only": False,
+        },
+    ),
+    (
+        PushNotification(
+            message=Message(
+                token="secret-token",
+                android=_ANDROID_GROUP,
+                apns=_APNS_FULL,
+            )
         ),
+        {
+            "message": {
+                "token": "secret-token",
+                "android": _ANDROID_GROUP_RESULT,
+                "apns": _APNS_FULL_RESULT,
+            },
+            "validate_only": False,
+        },
+    ),
+)
+
+
+@pytest.mark.parametrize(
+    "firebase_message, exp_result",
+    CLEANUP_FIREBASE_MESSAGE_CASES,
+    ids=(
+        "android_notification",
+        "android_config",
+        "aps_alert",
+        "aps",
+        "apns_payload",
+        "apns_config",
+        "notification",
+        "notification_with_image",
+        "message",
+        "push_notification_android",
+        "push_notification_android_apns",
     ),
 )
 def test_cleanup_firebase_message(firebase_message, exp_result):
@@ -282,6 +301,22 @@ def test_cleanup_firebase_message(firebase_message, exp_result):
             False,
             "https://fcm.googleapis.com/v1/projects/my-project/messages:send",
         ),
+        (
+            "https://base.ai/path?b=1",
+            [],
+            {"q": "test"},
+            False,
+            False,
+            "https://base.ai/path?q=test",
+        ),
+        (
+            "http://base.ai/path#fragment",
+            [],
+            {"q": "test"},
+            False,
+            False,
+            "http://base.ai/path?q=test",
+        ),
     ),
 )
 def test_join_url_common_flows(base, parts, params, leading_slash, trailing_slash, exp_result):